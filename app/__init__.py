@@ -1,5 +1,7 @@
 """Speaking Meeting Bot API package."""
 
+_app = None
+
 
 def get_application():
     """Get FastAPI application instance."""
@@ -8,5 +10,11 @@ def get_application():
     return create_app()
 
 
-# Only create the app when directly accessed, not on import
-app = get_application()
+def __getattr__(name):
+    """Lazily create the app on first access to ``app.app`` (PEP 562)."""
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = get_application()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -291,7 +291,8 @@ If not provided via command line, you will be prompted to enter it.""",
 
         # If we have API keys, try to match a voice
         if REPLICATE_KEY and UTFS_KEY and APP_ID:
-            voice_utils = VoiceUtils()
+            # Share the manager that just saved the new persona
+            voice_utils = VoiceUtils(persona_manager)
             voice_id = await voice_utils.match_voice_to_persona(args.key, language_code)
             if voice_id:
                 persona_data["cartesia_voice_id"] = voice_id
@@ -49,13 +49,10 @@ def generate_image_worker(
     try:
         logger.info(f"[{persona_name}] Starting image generation")
 
-        # Remove 'sk_live_' prefix if present
-        clean_api_key = api_key.replace("sk_live_", "")
+        # Set the API token for this process (main() already stripped 'sk_live_')
+        os.environ["REPLICATE_API_TOKEN"] = api_key
 
-        # Set the API token for this process
-        os.environ["REPLICATE_API_TOKEN"] = clean_api_key
-
-        logger.debug(f"[{persona_name}] Using API key: {clean_api_key[:8]}...")
+        logger.debug(f"[{persona_name}] Using API key: {api_key[:8]}...")
 
         # Run SDXL with the given prompt using the latest version
         output = replicate.run(
@@ -167,9 +164,7 @@ def main():
     else:
         logger.warning("No models found or error fetching models")
 
-    # Initialize PersonaManager
-    persona_manager.load_personas()
-
+    # persona_manager already loaded the personas on import
     # Create images directory (updated path)
     images_dir = Path(__file__).parent / "local_images"
     images_dir.mkdir(exist_ok=True)
@@ -51,7 +51,7 @@ async def migrate_personas():
 
             # Try to match voice if none exists
             if not persona_data.get("cartesia_voice_id"):
-                voice_utils = VoiceUtils()
+                voice_utils = VoiceUtils(persona_mgr)
                 voice_id = await voice_utils.match_voice_to_persona(
                     persona_dir.name, persona_data.get("language", "en")
                 )
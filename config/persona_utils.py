@@ -1,12 +1,15 @@
 import asyncio
+import json
 import os
 import random
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import aiohttp
-import markdown
 from dotenv import load_dotenv
 from loguru import logger
 
@@ -20,28 +23,97 @@ from config.prompts import (
 # Load environment variables from .env file
 load_dotenv()
 
+# Prefer orjson for the persona cache when installed; it is optional
+try:
+    import orjson
+
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _json_loads = json.loads
+
+# Bump whenever parse_readme/load_personas change the shape of parsed personas,
+# so caches written by an older parser are ignored
+_CACHE_VERSION = 1
+
+# Thread count for the I/O-bound bulk persona reads and writes
+_IO_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Metadata fields written to the README's Metadata section
+_METADATA_KEYS = frozenset(
+    {"image", "entry_message", "cartesia_voice_id", "gender", "relevant_links"}
+)
+
+# README bullet lists written for every persona
+_FORMATTED_CHARACTERISTICS = "\n".join(f"- {char}" for char in DEFAULT_CHARACTERISTICS)
+_FORMATTED_VOICE_CHARS = "\n".join(
+    f"- {char}" for char in DEFAULT_VOICE_CHARACTERISTICS
+)
+
 
 class PersonaManager:
+    # Title line, then everything after the first blank line (the prompt)
+    _TITLE_RE = re.compile(r"([^\n]*).*?\n\n(.*)", re.S)
+    # "- key: value" lines of the Metadata section
+    _META_RE = re.compile(r"^- (\w+): (.*)$", re.M)
+
     def __init__(self, personas_dir: Optional[Path] = None):
         """Initialize PersonaManager with optional custom personas directory"""
         self.personas_dir = personas_dir or Path(__file__).parent / "personas"
-        self.md = markdown.Markdown(extensions=["meta"])
+        self._personas_dir_str = str(self.personas_dir)
+        self._cache_path = self.personas_dir / ".personas_cache.json"
         self.personas = self.load_personas()
+        self._build_indexes()
+
+    def _build_indexes(self) -> None:
+        """Precompute lookup structures derived from the loaded personas"""
+        self._persona_keys: Tuple[str, ...] = tuple(self.personas)
+        # key -> (stored prompt, prompt + PERSONA_INTERACTION_INSTRUCTIONS)
+        self._full_prompts: Dict[str, Tuple[str, str]] = {
+            key: (
+                persona["prompt"],
+                persona["prompt"] + PERSONA_INTERACTION_INSTRUCTIONS,
+            )
+            for key, persona in self.personas.items()
+        }
+        self._key_words: Dict[str, frozenset] = {
+            key: frozenset(key.split("_")) for key in self.personas
+        }
+        word_index: Dict[str, List[str]] = defaultdict(list)
+        for key, key_words in self._key_words.items():
+            for word in key_words:
+                word_index[word].append(key)
+        self._word_index: Dict[str, List[str]] = dict(word_index)
+        self._by_display_name: Dict[str, str] = {}
+        for key, persona in self.personas.items():
+            self._by_display_name.setdefault(persona["name"], key)
+
+    def _indexes_stale(self, key: str) -> bool:
+        """Check whether a persona was added or renamed since the last index build"""
+        if key not in self.personas:
+            return False
+        return (
+            key not in self._key_words
+            or self.personas[key]["name"] not in self._by_display_name
+        )
 
     def parse_readme(self, content: str) -> Dict:
         """Parse README.md content to extract persona information"""
-        # Reset markdown instance for new content
-        self.md.reset()
-        html = self.md.convert(content)
-
-        # Split content by sections
-        sections = content.split("\n## ")
-
-        # Get name from first line (# Title)
-        name = sections[0].split("\n", 1)[0].replace("# ", "").strip()
-
-        # Get prompt (first paragraph after title)
-        prompt = sections[0].split("\n\n", 1)[1].strip()
+        # The title block runs up to the first "## " section
+        head_end = content.find("\n## ")
+        if head_end == -1:
+            head_end = len(content)
+
+        # Get name from first line (# Title) and prompt (text after the title)
+        title_match = self._TITLE_RE.match(content, 0, head_end)
+        if not title_match:
+            raise ValueError("README is missing a prompt paragraph after the title")
+        name = title_match.group(1).replace("# ", "").strip()
+        prompt = title_match.group(2).strip()
 
         # Parse metadata section
         metadata = {
@@ -51,24 +123,18 @@ class PersonaManager:
             "gender": "",
             "relevant_links": [],
         }  # Default values
-        for section in sections:
-            if section.startswith("Metadata"):
-                for line in section.split("\n"):
-                    if line.startswith("- "):
-                        try:
-                            key_value = line[2:].split(": ", 1)
-                            if len(key_value) == 2:
-                                key, value = key_value
-                                if key == "relevant_links":
-                                    # Split by spaces instead of commas for URLs
-                                    metadata[key] = [
-                                        url for url in value.strip().split() if url
-                                    ]
-                                else:
-                                    metadata[key] = value.strip()
-                        except ValueError:
-                            continue
-                break
+        meta_start = content.find("\n## Metadata")
+        if meta_start != -1:
+            meta_end = content.find("\n## ", meta_start + 1)
+            if meta_end == -1:
+                meta_end = len(content)
+            for match in self._META_RE.finditer(content, meta_start, meta_end):
+                key, value = match.groups()
+                if key == "relevant_links":
+                    # Split by spaces instead of commas for URLs
+                    metadata[key] = value.split()
+                else:
+                    metadata[key] = value.strip()
 
         return {
             "name": name,
@@ -80,7 +146,13 @@ class PersonaManager:
             "relevant_links": metadata.get("relevant_links", []),
         }
 
-    def load_additional_content(self, persona_dir: Path) -> str:
+    @staticmethod
+    def _read_text(path: Union[str, Path]) -> str:
+        """Read a UTF-8 file in binary mode, normalizing Windows line endings"""
+        with open(path, "rb") as f:
+            return f.read().decode("utf-8").replace("\r\n", "\n")
+
+    def load_additional_content(self, persona_dir: Union[str, Path]) -> str:
         """Load additional markdown content from persona directory"""
         additional_content = []
 
@@ -88,121 +160,211 @@ class PersonaManager:
         skip_files = {"README.md", ".DS_Store"}
 
         try:
-            for file_path in persona_dir.glob("*.md"):
-                if file_path.name not in skip_files:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        content = f.read().strip()
-                        if content:
-                            additional_content.append(
-                                f"# Content from {file_path.name}\n\n{content}"
-                            )
+            with os.scandir(persona_dir) as entries:
+                for entry in entries:
+                    if (
+                        not entry.name.endswith(".md")
+                        or entry.name.startswith(".")
+                        or entry.name in skip_files
+                        or not entry.is_file()
+                    ):
+                        continue
+                    content = self._read_text(entry.path).strip()
+                    if content:
+                        additional_content.append(
+                            f"# Content from {entry.name}\n\n{content}"
+                        )
         except Exception as e:
             logger.error(f"Error loading additional content from {persona_dir}: {e}")
 
         return "\n\n".join(additional_content)
 
-    def load_personas(self) -> Dict:
-        """Load personas from directory structure"""
-        personas = {}
+    def _scan_personas_dir(self) -> Tuple[List[List], List[Tuple[str, str]]]:
+        """Walk personas_dir once for the cache fingerprint and the persona dirs"""
+        # (path, mtime_ns, size) for every markdown file in a persona directory
+        fingerprint = []
+        with os.scandir(self.personas_dir) as persona_entries:
+            # Directory order is kept for loading, as with the original iterdir()
+            persona_dirs = [
+                e for e in persona_entries if e.is_dir(follow_symlinks=False)
+            ]
+        # The fingerprint is sorted so it compares equal across directory listings
+        for persona_entry in sorted(persona_dirs, key=lambda e: e.name):
+            with os.scandir(persona_entry.path) as entries:
+                md_files = sorted(
+                    (e for e in entries if e.name.endswith(".md")),
+                    key=lambda e: e.name,
+                )
+            for entry in md_files:
+                stat = entry.stat()
+                relative_path = f"{persona_entry.name}/{entry.name}"
+                fingerprint.append([relative_path, stat.st_mtime_ns, stat.st_size])
+        return fingerprint, [(e.name, e.path) for e in persona_dirs]
+
+    def _read_cache(self, fingerprint: List[List]) -> Optional[Dict]:
+        """Return cached personas if the cache matches the given fingerprint"""
         try:
-            for persona_dir in self.personas_dir.iterdir():
-                if not persona_dir.is_dir():
-                    continue
-
-                readme_file = persona_dir / "README.md"
-                if not readme_file.exists():
-                    logger.warning(
-                        f"Skipping persona without README: {persona_dir.name}"
+            with open(self._cache_path, "rb") as f:
+                cache = _json_loads(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable persona cache {self._cache_path}: {e}")
+            return None
+
+        if cache.get("version") != _CACHE_VERSION:
+            return None
+        if cache.get("fingerprint") != fingerprint:
+            return None
+        return cache.get("personas")
+
+    def _write_cache(self, fingerprint: List[List], personas: Dict) -> None:
+        """Atomically write parsed personas alongside their fingerprint"""
+        # Per-process temp name so concurrent bot processes never share a partial file
+        tmp_path = self._cache_path.with_name(
+            f"{self._cache_path.name}.{os.getpid()}.tmp"
+        )
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(
+                    _json_dumps(
+                        {
+                            "version": _CACHE_VERSION,
+                            "fingerprint": fingerprint,
+                            "personas": personas,
+                        }
                     )
-                    continue
+                )
+            os.replace(tmp_path, self._cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write persona cache {self._cache_path}: {e}")
+
+    def _load_persona_dir(self, name: str, path: str) -> Optional[Tuple[str, Dict]]:
+        """Read and parse a single persona directory"""
+        try:
+            content = self._read_text(path + os.sep + "README.md")
+        except FileNotFoundError:
+            logger.warning(f"Skipping persona without README: {name}")
+            return None
 
-                with open(readme_file, "r", encoding="utf-8") as f:
-                    content = f.read()
-                    persona_data = self.parse_readme(content)
+        persona_data = self.parse_readme(content)
 
-                    # Load additional content
-                    additional_content = self.load_additional_content(persona_dir)
-                    if additional_content:
-                        persona_data["additional_content"] = additional_content
+        # Load additional content
+        additional_content = self.load_additional_content(path)
+        if additional_content:
+            persona_data["additional_content"] = additional_content
 
-                    personas[persona_dir.name] = persona_data
+        return name, persona_data
 
+    def load_personas(self) -> Dict:
+        """Load personas from directory structure, reusing the cache when fresh"""
+        personas = {}
+        try:
+            fingerprint, persona_dirs = self._scan_personas_dir()
+            cached = self._read_cache(fingerprint)
+            if cached is not None:
+                return cached
+
+            # Reads dominate here and release the GIL, so overlap them
+            with ThreadPoolExecutor(max_workers=_IO_WORKERS) as executor:
+                for result in executor.map(
+                    lambda item: self._load_persona_dir(*item), persona_dirs
+                ):
+                    if result is not None:
+                        key, persona_data = result
+                        personas[key] = persona_data
+
+            self._write_cache(fingerprint, personas)
             return personas
         except Exception as e:
             logger.error(f"Failed to load personas: {e}")
             raise
 
-    def save_persona(self, key: str, persona: Dict) -> bool:
-        """Save a single persona's data"""
-        try:
-            persona_dir = self.personas_dir / key
-            persona_dir.mkdir(exist_ok=True)
-
-            # Read existing README if it exists to preserve metadata
-            readme_file = persona_dir / "README.md"
-            existing_metadata = {}
-            if readme_file.exists():
-                with open(readme_file, "r", encoding="utf-8") as f:
-                    existing_persona = self.parse_readme(f.read())
-                    # Preserve all existing metadata fields
-                    existing_metadata = {
-                        "image": existing_persona.get("image", ""),
-                        "entry_message": existing_persona.get(
-                            "entry_message", DEFAULT_ENTRY_MESSAGE
-                        ),
-                        "cartesia_voice_id": existing_persona.get(
-                            "cartesia_voice_id", ""
-                        ),
-                        "gender": existing_persona.get("gender", ""),
-                        "relevant_links": existing_persona.get("relevant_links", []),
-                    }
-
-            # Merge existing metadata with new data, preferring new data when available
-            metadata = {
-                "image": persona.get("image", existing_metadata.get("image", "")),
-                "entry_message": persona.get(
-                    "entry_message",
-                    existing_metadata.get("entry_message", DEFAULT_ENTRY_MESSAGE),
-                ),
-                "cartesia_voice_id": persona.get(
-                    "cartesia_voice_id", existing_metadata.get("cartesia_voice_id", "")
-                ),
-                "gender": persona.get(
-                    "gender",
-                    existing_metadata.get("gender", random.choice(["MALE", "FEMALE"])),
-                ),
-                "relevant_links": persona.get(
-                    "relevant_links", existing_metadata.get("relevant_links", [])
+    def _render_readme(self, key: str, persona: Dict) -> Tuple[str, List[str]]:
+        """Build the README path and content for a persona"""
+        persona_dir = self._personas_dir_str + os.sep + key
+        os.makedirs(persona_dir, exist_ok=True)
+
+        # Preserve metadata from the loaded persona. Fall back to the README when
+        # the key is not loaded, or when the in-memory entry was replaced by a
+        # dict that lacks some metadata (e.g. create_persona overwriting a key)
+        readme_file = persona_dir + os.sep + "README.md"
+        existing_persona = self.personas.get(key)
+        if existing_persona is None or (
+            existing_persona is persona and not _METADATA_KEYS <= persona.keys()
+        ):
+            existing_persona = None
+            if os.path.exists(readme_file):
+                existing_persona = self.parse_readme(self._read_text(readme_file))
+
+        existing_metadata = {}
+        if existing_persona is not None:
+            # Preserve all existing metadata fields
+            existing_metadata = {
+                "image": existing_persona.get("image", ""),
+                "entry_message": existing_persona.get(
+                    "entry_message", DEFAULT_ENTRY_MESSAGE
                 ),
+                "cartesia_voice_id": existing_persona.get("cartesia_voice_id", ""),
+                "gender": existing_persona.get("gender", ""),
+                "relevant_links": existing_persona.get("relevant_links", []),
             }
 
-            # Format characteristics and voice characteristics
-            characteristics = "\n".join(f"- {char}" for char in DEFAULT_CHARACTERISTICS)
-            voice_chars = "\n".join(
-                f"- {char}" for char in DEFAULT_VOICE_CHARACTERISTICS
-            )
-
-            readme_content = f"""# {persona['name']}
-
-{persona['prompt']}
-
-## Characteristics
-{characteristics}
+        # Merge existing metadata with new data, preferring new data when available
+        metadata = {
+            "image": persona.get("image", existing_metadata.get("image", "")),
+            "entry_message": persona.get(
+                "entry_message",
+                existing_metadata.get("entry_message", DEFAULT_ENTRY_MESSAGE),
+            ),
+            "cartesia_voice_id": persona.get(
+                "cartesia_voice_id", existing_metadata.get("cartesia_voice_id", "")
+            ),
+            "gender": persona.get(
+                "gender",
+                existing_metadata.get("gender", random.choice(["MALE", "FEMALE"])),
+            ),
+            "relevant_links": persona.get(
+                "relevant_links", existing_metadata.get("relevant_links", [])
+            ),
+        }
 
-## Voice
-{persona['name']} speaks with:
-{voice_chars}
+        # Kept as separate chunks so the prompt is never copied into one big string
+        # fmt: off
+        readme_parts = [
+            "# ", persona["name"], "\n\n",
+            persona["prompt"], "\n\n",
+            "## Characteristics\n", _FORMATTED_CHARACTERISTICS, "\n\n",
+            "## Voice\n", persona["name"], " speaks with:\n",
+            _FORMATTED_VOICE_CHARS, "\n\n",
+            "## Metadata\n",
+            "- image: ", str(metadata["image"]), "\n",
+            "- entry_message: ", str(metadata["entry_message"]), "\n",
+            "- cartesia_voice_id: ", str(metadata["cartesia_voice_id"]), "\n",
+            "- gender: ", str(metadata["gender"]), "\n",
+            "- relevant_links: ", " ".join(metadata["relevant_links"]), "\n",
+        ]
+        # fmt: on
+
+        return readme_file, readme_parts
+
+    @staticmethod
+    def _write_readme(readme_file: str, readme_parts: List[str]) -> None:
+        """Write a README atomically so readers never see a partial file"""
+        tmp_file = readme_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.writelines(readme_parts)
+        os.replace(tmp_file, readme_file)
 
-## Metadata
-- image: {metadata['image']}
-- entry_message: {metadata['entry_message']}
-- cartesia_voice_id: {metadata['cartesia_voice_id']}
-- gender: {metadata['gender']}
-- relevant_links: {' '.join(metadata['relevant_links'])}
-"""
+    def save_persona(self, key: str, persona: Dict) -> bool:
+        """Save a single persona's data"""
+        try:
+            readme_file, readme_parts = self._render_readme(key, persona)
+            self._write_readme(readme_file, readme_parts)
 
-            with open(readme_file, "w", encoding="utf-8") as f:
-                f.write(readme_content)
+            # Added or renamed personas must become reachable through the lookups
+            if self._indexes_stale(key):
+                self._build_indexes()
 
             return True
         except Exception as e:
@@ -212,10 +374,30 @@ class PersonaManager:
     def save_personas(self) -> bool:
         """Save all personas to their respective README files"""
         success = True
+
+        # Render everything up front so only the writes run concurrently
+        rendered = []
         for key, persona in self.personas.items():
-            if not self.save_persona(key, persona):
+            try:
+                rendered.append((key, *self._render_readme(key, persona)))
+            except Exception as e:
+                logger.error(f"Failed to save persona {key}: {e}")
+                success = False
+
+        def write(item: Tuple[str, str, List[str]]) -> bool:
+            key, readme_file, readme_parts = item
+            try:
+                self._write_readme(readme_file, readme_parts)
+                return True
+            except Exception as e:
+                logger.error(f"Failed to save persona {key}: {e}")
+                return False
+
+        with ThreadPoolExecutor(max_workers=_IO_WORKERS) as executor:
+            if not all(list(executor.map(write, rendered))):
                 success = False
-                logger.error(f"Failed to save persona {key}")
+
+        self._build_indexes()
         return success
 
     def list_personas(self) -> List[str]:
@@ -230,23 +412,27 @@ class PersonaManager:
 
             # First try exact folder match
             if folder_name in self.personas:
-                persona = self.personas[folder_name].copy()
+                persona_key = folder_name
                 logger.info(f"Using specified persona folder: {folder_name}")
             else:
-                # Try to find the closest match among folder names
+                # Only folders sharing at least one word with the name are candidates
                 words = set(name.lower().split())
+                candidates = {
+                    key for word in words for key in self._word_index.get(word, ())
+                }
+                # Score in persona order; the first best match wins, as before
                 closest_match = None
                 max_overlap = 0
-
-                for persona_key in self.personas.keys():
-                    persona_words = set(persona_key.split("_"))
-                    overlap = len(words & persona_words)
+                for persona_key in self._persona_keys:
+                    if persona_key not in candidates:
+                        continue
+                    overlap = len(words & self._key_words[persona_key])
                     if overlap > max_overlap:
                         max_overlap = overlap
                         closest_match = persona_key
 
-                if closest_match and max_overlap >= 1:  # At least 1 word matches
-                    persona = self.personas[closest_match].copy()
+                if closest_match:
+                    persona_key = closest_match
                     logger.warning(
                         f"Using closest matching persona folder: {closest_match} (from: {name})"
                     )
@@ -255,28 +441,37 @@ class PersonaManager:
                         f"Persona '{name}' not found. Valid options: {', '.join(self.personas.keys())}"
                     )
         else:
-            persona = random.choice(list(self.personas.values())).copy()
-            logger.info(f"Randomly selected persona: {persona['name']}")
-
-        # Only set default image if needed for display purposes
-        if not persona.get("image"):
-            persona["image"] = ""  # Empty string instead of default URL
-
-        persona["prompt"] = persona["prompt"] + PERSONA_INTERACTION_INSTRUCTIONS
-        # Add the path to the persona's directory using the normalized name
-        persona_key = (
-            name.lower().replace(" ", "_")
-            if name
-            else persona["name"].lower().replace(" ", "_")
-        )
-        persona["path"] = os.path.join(self.personas_dir, persona_key)
-        return persona
+            persona_key = self._persona_keys[random.randrange(len(self._persona_keys))]
+            logger.info(
+                f"Randomly selected persona: {self.personas[persona_key]['name']}"
+            )
+
+        persona = self.personas[persona_key]
+
+        # Reuse the precomputed full prompt unless the stored prompt was replaced
+        full_prompt = self._full_prompts.get(persona_key)
+        if full_prompt is None or full_prompt[0] is not persona["prompt"]:
+            full_prompt = (
+                persona["prompt"],
+                persona["prompt"] + PERSONA_INTERACTION_INSTRUCTIONS,
+            )
+            self._full_prompts[persona_key] = full_prompt
+
+        # Build the result in one pass; unchanged fields keep sharing their values
+        return {
+            **persona,
+            # Only set default image if needed for display purposes
+            "image": persona.get("image") or "",
+            "prompt": full_prompt[1],
+            # Add the path to the resolved persona's directory
+            "path": self._personas_dir_str + os.sep + persona_key,
+        }
 
     def get_persona_by_name(self, name: str) -> Dict:
         """Get a specific persona by display name"""
-        for persona in self.personas.values():
-            if persona["name"] == name:
-                return persona.copy()
+        persona = self.personas.get(self._by_display_name.get(name))
+        if persona is not None and persona["name"] == name:
+            return persona.copy()
         raise KeyError(
             f"Persona '{name}' not found. Valid options: {', '.join(p['name'] for p in self.personas.values())}"
         )
@@ -10,6 +10,7 @@ from loguru import logger
 from openai import OpenAI
 
 from config.persona_utils import PersonaManager
+from config.persona_utils import persona_manager as shared_persona_manager
 
 # Load environment variables
 load_dotenv()
@@ -70,9 +71,10 @@ cartesia_voice_manager = CartesiaVoiceManager()
 
 
 class VoiceUtils:
-    def __init__(self):
+    def __init__(self, persona_manager: Optional[PersonaManager] = None):
+        """Initialize VoiceUtils, defaulting to the shared persona manager"""
         self.client = OpenAI(api_key=OPENAI_API_KEY)
-        self.persona_manager = PersonaManager()
+        self.persona_manager = persona_manager or shared_persona_manager
 
     async def save_voices_to_md(self) -> Optional[Path]:
         """Save all available Cartesia voices to a markdown file"""
@@ -0,0 +1,140 @@
+"""Tests for config.persona_utils.PersonaManager."""
+
+from config import persona_utils
+from config.persona_utils import PersonaManager
+
+README = """# Buddhist Monk
+
+A calm monk who answers with parables.
+
+## Metadata
+- image: https://example.com/monk.png
+- entry_message: Peace be with you
+- cartesia_voice_id: cd17ff2d-voice
+- gender: MALE
+- relevant_links: https://example.com/a https://example.com/b
+"""
+
+
+def test_overwrite_preserves_metadata_missing_from_new_data(tmp_path):
+    persona_dir = tmp_path / "buddhist_monk"
+    persona_dir.mkdir()
+    (persona_dir / "README.md").write_text(README, encoding="utf-8")
+    manager = PersonaManager(tmp_path)
+
+    # Mirrors config/create_persona.py: replace the entry, then save it
+    new_data = {"name": "Buddhist Monk", "prompt": "A new prompt."}
+    manager.personas["buddhist_monk"] = new_data
+    assert manager.save_persona("buddhist_monk", new_data)
+
+    saved = manager.parse_readme(
+        (persona_dir / "README.md").read_text(encoding="utf-8")
+    )
+    assert saved["prompt"] == "A new prompt."
+    assert saved["cartesia_voice_id"] == "cd17ff2d-voice"
+    assert saved["image"] == "https://example.com/monk.png"
+    assert saved["gender"] == "MALE"
+    assert saved["relevant_links"] == [
+        "https://example.com/a",
+        "https://example.com/b",
+    ]
+
+
+def _count_readme_reads(monkeypatch):
+    """Patch PersonaManager._read_text and return the list of paths it reads."""
+    reads = []
+    read_text = PersonaManager._read_text
+
+    def counting_read_text(path):
+        reads.append(str(path))
+        return read_text(path)
+
+    monkeypatch.setattr(PersonaManager, "_read_text", staticmethod(counting_read_text))
+    return reads
+
+
+def test_in_place_update_does_not_reread_readme(tmp_path, monkeypatch):
+    persona_dir = tmp_path / "buddhist_monk"
+    persona_dir.mkdir()
+    (persona_dir / "README.md").write_text(README, encoding="utf-8")
+    manager = PersonaManager(tmp_path)
+    reads = _count_readme_reads(monkeypatch)
+
+    assert manager.update_persona_image("buddhist_monk", "https://example.com/new.png")
+
+    assert reads == []
+    saved = manager.parse_readme(
+        (persona_dir / "README.md").read_text(encoding="utf-8")
+    )
+    assert saved["image"] == "https://example.com/new.png"
+    assert saved["cartesia_voice_id"] == "cd17ff2d-voice"
+
+
+def test_save_personas_renders_without_reading_readmes(tmp_path, monkeypatch):
+    for key in ("buddhist_monk", "zen_gardener", "tea_master"):
+        persona_dir = tmp_path / key
+        persona_dir.mkdir()
+        (persona_dir / "README.md").write_text(README, encoding="utf-8")
+    manager = PersonaManager(tmp_path)
+    reads = _count_readme_reads(monkeypatch)
+
+    assert manager.save_personas()
+
+    assert reads == []
+    for key in ("buddhist_monk", "zen_gardener", "tea_master"):
+        saved = manager.parse_readme(
+            (tmp_path / key / "README.md").read_text(encoding="utf-8")
+        )
+        assert saved["cartesia_voice_id"] == "cd17ff2d-voice"
+
+
+def _write_persona(tmp_path, key="buddhist_monk", readme=README):
+    persona_dir = tmp_path / key
+    persona_dir.mkdir(exist_ok=True)
+    (persona_dir / "README.md").write_text(readme, encoding="utf-8")
+    return persona_dir
+
+
+def test_unchanged_files_are_served_from_cache(tmp_path, monkeypatch):
+    _write_persona(tmp_path)
+    first = PersonaManager(tmp_path).personas
+    reads = _count_readme_reads(monkeypatch)
+
+    assert PersonaManager(tmp_path).personas == first
+    assert reads == []
+
+
+def test_edited_readme_invalidates_cache(tmp_path):
+    persona_dir = _write_persona(tmp_path)
+    PersonaManager(tmp_path)
+
+    (persona_dir / "README.md").write_text(
+        README.replace("answers with parables", "answers only in short koans"),
+        encoding="utf-8",
+    )
+
+    persona = PersonaManager(tmp_path).personas["buddhist_monk"]
+    assert persona["prompt"] == "A calm monk who answers only in short koans."
+
+
+def test_added_markdown_file_invalidates_cache(tmp_path):
+    persona_dir = _write_persona(tmp_path)
+    assert "additional_content" not in PersonaManager(tmp_path).personas[
+        "buddhist_monk"
+    ]
+
+    (persona_dir / "sutras.md").write_text("Heart Sutra", encoding="utf-8")
+
+    persona = PersonaManager(tmp_path).personas["buddhist_monk"]
+    assert persona["additional_content"] == "# Content from sutras.md\n\nHeart Sutra"
+
+
+def test_cache_from_other_version_is_ignored(tmp_path, monkeypatch):
+    _write_persona(tmp_path)
+    PersonaManager(tmp_path)
+    monkeypatch.setattr(persona_utils, "_CACHE_VERSION", -1)
+    reads = _count_readme_reads(monkeypatch)
+
+    PersonaManager(tmp_path)
+
+    assert reads == [str(tmp_path / "buddhist_monk" / "README.md")]